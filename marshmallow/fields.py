@@ -22,12 +22,12 @@ class Str(Field):
         return value
 
 
-_EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
 
 
 class Email(Str):
     def deserialize(self, value: Any):
         value = super().deserialize(value)
-        if not _EMAIL_PATTERN.match(value):
+        if not _EMAIL_PATTERN.fullmatch(value):
             raise ValidationError('Not a valid email address.')
         return value
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional
 
 from .exceptions import ValidationError
 from .fields import Field
@@ -22,23 +22,67 @@ class SchemaMeta(type):
 
         declared_fields.update(fields_for_class)
         attrs['_declared_fields'] = declared_fields
+        attrs['_required_fields'] = tuple(
+            field_name for field_name, field in declared_fields.items() if field.required
+        )
         return super().__new__(mcls, name, bases, attrs)
 
 
 class Schema(metaclass=SchemaMeta):
-    def load(self, data: Any, partial: bool = False):
+    def __init__(self, *, partial: bool = False):
+        self.partial = partial
+
+    def load(self, data: Any, partial: Optional[bool] = None):
+        if partial is None:
+            partial = self.partial
+        result, errors = self._load_one(data, partial)
+        if errors:
+            raise ValidationError(errors)
+        return result
+
+    def load_many(self, records: Iterable[Any], partial: Optional[bool] = None):
+        """Validate a batch of records, keying any errors by record index."""
+
+        if partial is None:
+            partial = self.partial
+        results: List[Dict[str, Any]] = []
+        errors: Dict[int, Any] = {}
+        load_one = self._load_one
+
+        for index, data in enumerate(records):
+            result, record_errors = load_one(data, partial)
+            if record_errors:
+                errors[index] = record_errors
+            else:
+                results.append(result)
+
+        if errors:
+            raise ValidationError(errors)
+        return results
+
+    def _load_one(self, data: Any, partial: bool):
         if not isinstance(data, dict):
-            raise ValidationError({'_schema': ['Invalid input type.']})
+            return {}, {'_schema': ['Invalid input type.']}
 
         errors: Dict[str, Any] = {}
         result: Dict[str, Any] = {}
 
-        for field_name, field in self._declared_fields.items():
-            if field_name not in data:
-                if field.required and not partial:
-                    errors.setdefault(field_name, []).append('Missing data for required field.')
-                continue
+        declared_fields = self._declared_fields
+        # Walk whichever side is smaller; unknown keys in ``data`` are ignored.
+        if len(data) < len(declared_fields):
+            present = [
+                (field_name, declared_fields[field_name])
+                for field_name in data
+                if field_name in declared_fields
+            ]
+        else:
+            present = [
+                (field_name, field)
+                for field_name, field in declared_fields.items()
+                if field_name in data
+            ]
 
+        for field_name, field in present:
             try:
                 result[field_name] = field.deserialize(data[field_name])
             except ValidationError as err:
@@ -48,13 +92,9 @@ class Schema(metaclass=SchemaMeta):
                 else:
                     errors.setdefault(field_name, []).append(message)
 
-        if errors:
-            raise ValidationError(errors)
-
-        for field_name in data.keys():
-            if field_name in self._declared_fields:
-                continue
-            # Preserve whitelisted fields only; unknowns are ignored.
-            pass
+        if not partial:
+            for field_name in self._required_fields:
+                if field_name not in data:
+                    errors.setdefault(field_name, []).append('Missing data for required field.')
 
-        return result
+        return result, errors
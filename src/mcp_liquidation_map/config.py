@@ -1,10 +1,13 @@
 """Application configuration utilities."""
+import functools
 import os
+from pathlib import Path
 from typing import Optional
 
 
-BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-DEFAULT_SQLITE_PATH = os.path.join(BASE_DIR, "database", "app.db")
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_SQLITE_PATH = str(BASE_DIR / "database" / "app.db")
+STATIC_DIR = str(BASE_DIR / "static")
 
 
 def _str_to_bool(value: Optional[str], default: bool = False) -> bool:
@@ -36,12 +39,15 @@ class Config:
     USER_API_TOKEN = os.getenv("USER_API_TOKEN")
 
 
+@functools.lru_cache(maxsize=1)
 def get_config() -> Config:
     """Return the default :class:`Config` instance.
 
     Ensures that a ``SECRET_KEY`` is provided when ``DEBUG`` is disabled so
     deployments fail fast with a clear error instead of silently running with a
-    weak default secret.
+    weak default secret. The instance is built once per process. ``Config``
+    reads the environment when this module is imported, so picking up changed
+    variables requires reloading the module, not just ``get_config.cache_clear()``.
     """
 
     config = Config()
@@ -10,17 +10,19 @@ from flask import current_app
 # access to the values within the .ini file in use.
 config = context.config
 
-if config.config_file_name is not None:
+# The ini attaches its console handler to the root logger, so an existing root
+# handler means logging is already configured and the file need not be re-read.
+if config.config_file_name is not None and not logging.getLogger().handlers:
     fileConfig(config.config_file_name)
 
 logger = logging.getLogger("alembic.env")
 
 
 def get_engine():
-    try:
-        return current_app.extensions["migrate"].db.get_engine()
-    except TypeError:
-        return current_app.extensions["migrate"].db.engine
+    db = current_app.extensions["migrate"].db
+    if hasattr(db, "engine"):
+        return db.engine
+    return db.get_engine()
 
 
 def get_metadata():
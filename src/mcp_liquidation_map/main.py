@@ -1,6 +1,10 @@
+"""Canonical Flask application module.
+
+Every HTTP entrypoint (``python -m``, the Flask CLI and WSGI servers) should
+target ``mcp_liquidation_map.main:app`` so blueprints are registered once.
+"""
 import logging
 import os
-
 import sys
 
 # DON'T CHANGE THIS !!!
@@ -10,7 +14,7 @@ from flask import Flask, jsonify, send_from_directory
 from flask_migrate import Migrate
 from sqlalchemy import inspect
 
-from mcp_liquidation_map.config import get_config
+from mcp_liquidation_map.config import STATIC_DIR, get_config
 from mcp_liquidation_map.models.user import db
 from mcp_liquidation_map.routes.crypto import crypto_bp
 from mcp_liquidation_map.routes.user import user_bp
@@ -42,7 +46,7 @@ def configure_logging():
 
 configure_logging()
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+app = Flask(__name__, static_folder=STATIC_DIR)
 app.config.from_object(get_config())
 
 
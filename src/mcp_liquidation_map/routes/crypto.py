@@ -1,19 +1,30 @@
+import json
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from types import MappingProxyType
+from typing import Optional, Tuple
 
 import requests
 from flask import Blueprint, current_app, jsonify, request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from werkzeug.exceptions import BadRequest
 
-from mcp_liquidation_map.services.browsercat_client import browsercat_client
+from mcp_liquidation_map.services.browsercat_client import get_browsercat_client
 
 _TRUTHY_STRINGS = {'1', 'true', 'yes', 'on'}
 _FALSY_STRINGS = {'0', 'false', 'no', 'off'}
+_BOOL_STRINGS = {
+    **dict.fromkeys(_TRUTHY_STRINGS, True),
+    **dict.fromkeys(_FALSY_STRINGS, False),
+}
 
-_COINGECKO_SYMBOL_MAP = {
+_COINGECKO_SYMBOL_MAP = MappingProxyType({
     'BTC': 'bitcoin',
     'ETH': 'ethereum',
     'BNB': 'binancecoin',
@@ -24,14 +35,55 @@ _COINGECKO_SYMBOL_MAP = {
     'DOGE': 'dogecoin',
     'AVAX': 'avalanche-2',
     'MATIC': 'matic-network',
-}
+})
 
-_VALID_TIMEFRAMES = ["12 hour", "24 hour", "1 month", "3 month"]
+_TIMEFRAME_CHOICES = ("12 hour", "24 hour", "1 month", "3 month")
+_VALID_TIMEFRAMES = frozenset(_TIMEFRAME_CHOICES)
+_INVALID_TIMEFRAME_MESSAGE = f'Invalid timeframe. Use: {", ".join(_TIMEFRAME_CHOICES)}'
 
 crypto_bp = Blueprint('crypto', __name__)
 
 logger = logging.getLogger(__name__)
 
+# Pre-encoded bodies for error responses that never vary.
+_INVALID_JSON_BODY = json.dumps({'error': 'Invalid JSON payload.'}).encode()
+_INTERNAL_ERROR_BODY = json.dumps({'error': 'Internal server error.'}).encode()
+
+_HEALTH_CACHE_WINDOW = 0.25
+# (monotonic build time, encoded body) for the most recent health response.
+_health_cache: Tuple[float, bytes] = (float('-inf'), b'')
+
+_PRICE_CACHE_TTL = 5.0
+# Coin ids come from user-supplied symbols, so keep the cache bounded.
+_PRICE_CACHE_MAX_ENTRIES = 256
+# coin_id -> (monotonic expiry, raw USD price, formatted price), least recently used first.
+_price_cache: 'OrderedDict[str, Tuple[float, float, str]]' = OrderedDict()
+_price_cache_lock = threading.Lock()
+
+
+def _build_coingecko_session() -> requests.Session:
+    """Create a keep-alive session so CoinGecko calls reuse TLS connections."""
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+            # An upstream Retry-After could stall a worker far past the
+            # request timeout; the capped backoff above is enough.
+            respect_retry_after_header=False,
+        ),
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+_coingecko_session = _build_coingecko_session()
+
 
 @dataclass
 class ServiceResult:
@@ -44,7 +96,34 @@ class ServiceResult:
 def _resolve_coin_id(symbol: str) -> str:
     """Map a symbol to CoinGecko's identifier when available."""
 
-    return _COINGECKO_SYMBOL_MAP.get(symbol, symbol.lower())
+    return _COINGECKO_SYMBOL_MAP.get(symbol) or symbol.lower()
+
+
+def _get_cached_price(coin_id: str) -> Optional[Tuple[float, float, str]]:
+    """Return a fresh cached price entry, dropping it if it has expired."""
+    with _price_cache_lock:
+        cached = _price_cache.get(coin_id)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic():
+            del _price_cache[coin_id]
+            return None
+        _price_cache.move_to_end(coin_id)
+        return cached
+
+
+def _store_price(coin_id: str, price_usd: float, formatted_price: str) -> None:
+    """Cache a price, evicting expired entries and then the least recently used."""
+    now = time.monotonic()
+    with _price_cache_lock:
+        expired = [key for key, (expires_at, _, _) in _price_cache.items() if expires_at <= now]
+        for key in expired:
+            del _price_cache[key]
+
+        _price_cache[coin_id] = (now + _PRICE_CACHE_TTL, price_usd, formatted_price)
+        _price_cache.move_to_end(coin_id)
+        while len(_price_cache) > _PRICE_CACHE_MAX_ENTRIES:
+            _price_cache.popitem(last=False)
 
 
 def build_crypto_price_result(
@@ -60,10 +139,15 @@ def build_crypto_price_result(
 
     symbol = symbol.upper()
     coin_id = _resolve_coin_id(symbol)
+
+    cached = _get_cached_price(coin_id)
+    if cached is not None:
+        return ServiceResult({'price': cached[2], 'price_usd': cached[1], 'symbol': symbol})
+
     url = f"https://api.coingecko.com/api/v3/simple/price?ids={coin_id}&vs_currencies=usd"
 
     try:
-        response = requests.get(url, timeout=10)
+        response = _coingecko_session.get(url, timeout=10)
     except requests.RequestException as request_error:
         log.error(
             'Request error while fetching price for %s: %s',
@@ -88,12 +172,15 @@ def build_crypto_price_result(
         }, 500)
 
     data = response.json()
-    price = data.get(coin_id, {}).get('usd')
+    coin_data = data.get(coin_id)
+    price = coin_data.get('usd') if coin_data else None
     if price is None:
         return ServiceResult({'error': f'Price not found for {symbol}', 'status_code': 404}, 404)
 
+    price_usd = float(price)
     formatted_price = f"${price:,.2f}"
-    return ServiceResult({'price': formatted_price, 'symbol': symbol})
+    _store_price(coin_id, price_usd, formatted_price)
+    return ServiceResult({'price': formatted_price, 'price_usd': price_usd, 'symbol': symbol})
 
 
 def _resolve_allow_simulated(allow_simulated_override: Optional[bool]) -> bool:
@@ -122,14 +209,14 @@ def build_heatmap_result(
     symbol = symbol.upper()
     if time_period not in _VALID_TIMEFRAMES:
         return ServiceResult({
-            'error': f'Invalid timeframe. Use: {", ".join(_VALID_TIMEFRAMES)}',
+            'error': _INVALID_TIMEFRAME_MESSAGE,
             'status_code': 400,
         }, 400)
 
     allow_simulated = _resolve_allow_simulated(allow_simulated_override)
 
     try:
-        heatmap_result = browsercat_client.capture_coinglass_heatmap(symbol, time_period)
+        heatmap_result = get_browsercat_client().capture_coinglass_heatmap(symbol, time_period)
     except Exception as browsercat_error:
         log.error(
             "BrowserCat client error for symbol=%s, time_period=%s: %s",
@@ -201,6 +288,24 @@ def build_heatmap_result(
     return ServiceResult(payload)
 
 
+def _read_json():
+    """Decode a JSON request body, raising ``BadRequest`` if it is missing or not JSON."""
+    if not request.is_json:
+        raise BadRequest('Request body must be sent as application/json.')
+    raw = request.get_data(cache=False)
+    if not raw:
+        raise BadRequest('Request body is empty.')
+    try:
+        return json.loads(raw)
+    except ValueError as decode_error:
+        raise BadRequest('Failed to decode JSON object.') from decode_error
+
+
+def _static_json_response(body: bytes, status: int):
+    """Wrap a pre-encoded JSON body in a fresh response object."""
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+
 def _get_logger():
     """Return the active application logger when available."""
     try:
@@ -221,63 +326,57 @@ def get_crypto_price():
     - error (string, optional): Error message if operation fails
     """
     symbol = None
+    log = _get_logger()
     try:
         if request.method == 'GET':
             symbol = request.args.get('symbol')
         else:  # POST
-            data = request.get_json()
+            data = _read_json()
             symbol = data.get('symbol') if data else None
 
-        result = build_crypto_price_result(symbol, log=_get_logger())
+        result = build_crypto_price_result(symbol, log=log)
         return jsonify(result.payload), result.status_code
 
     except BadRequest as json_error:
         symbol_for_log = symbol or 'unknown'
-        _get_logger().warning(
+        log.warning(
             "Invalid JSON payload while fetching price for symbol=%s: %s",
             symbol_for_log,
             json_error,
         )
-        return jsonify({'error': 'Invalid JSON payload.'}), 400
+        return _static_json_response(_INVALID_JSON_BODY, 400)
     except Exception as e:
-        symbol_for_log = symbol or 'unknown'
-        _get_logger().error(
+        log.error(
             "Error fetching price for symbol=%s: %s",
-            symbol_for_log,
+            symbol or 'unknown',
             e,
             exc_info=True,
         )
-        return jsonify({'error': 'Internal server error.'}), 500
+        return _static_json_response(_INTERNAL_ERROR_BODY, 500)
 
 def _parse_bool(value):
     """Parse common truthy/falsey values to booleans."""
     if value is None:
         return None
-    if isinstance(value, bool):
+    if value.__class__ is bool:
         return value
+    if isinstance(value, str):
+        return _BOOL_STRINGS.get(value.strip().lower())
     if isinstance(value, (int, float)):
         return value != 0
-    if isinstance(value, str):
-        lower_value = value.strip().lower()
-        if lower_value in _TRUTHY_STRINGS:
-            return True
-        if lower_value in _FALSY_STRINGS:
-            return False
     return None
 
 
 def _build_simulated_payload(symbol: str, time_period: str):
     """Create a simulated heatmap payload used for non-production fallbacks."""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    image_filename = f"{symbol.lower()}_liquidation_heatmap_{timestamp}_{time_period.replace(' ', '_')}.png"
-    simulated_path = f"/tmp/{image_filename}"
-
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
+    slug = time_period.replace(' ', '_')
     return {
-        'image_path': simulated_path,
+        'image_path': f"/tmp/{symbol.lower()}_liquidation_heatmap_{timestamp}_{slug}.png",
         'symbol': symbol,
         'time_period': time_period,
         'note': 'Simulated heatmap placeholder generated without BrowserCat.',
-        'simulated': True
+        'simulated': True,
     }
 
 
@@ -296,13 +395,14 @@ def capture_heatmap():
     """
     symbol = None
     time_period = None
+    log = _get_logger()
     try:
         if request.method == 'GET':
             symbol = request.args.get('symbol', 'BTC')
             time_period = request.args.get('time_period', '24 hour')
             allow_simulated_param = request.args.get('allow_simulated')
         else:  # POST
-            data = request.get_json()
+            data = _read_json()
             symbol = data.get('symbol', 'BTC') if data else 'BTC'
             time_period = data.get('time_period', '24 hour') if data else '24 hour'
             allow_simulated_param = data.get('allow_simulated') if data else None
@@ -312,34 +412,45 @@ def capture_heatmap():
             symbol,
             time_period,
             allow_simulated_override,
-            log=_get_logger(),
+            log=log,
         )
         return jsonify(result.payload), result.status_code
 
     except BadRequest as json_error:
         symbol_for_log = symbol or 'unknown'
         time_period_for_log = time_period or 'unknown'
-        _get_logger().warning(
+        log.warning(
             "Invalid JSON payload for capture_heatmap (symbol=%s, time_period=%s): %s",
             symbol_for_log,
             time_period_for_log,
             json_error,
         )
-        return jsonify({'error': 'Invalid JSON payload.'}), 400
+        return _static_json_response(_INVALID_JSON_BODY, 400)
     except Exception as e:
-        symbol_for_log = symbol or 'unknown'
-        time_period_for_log = time_period or 'unknown'
-        _get_logger().error(
+        log.error(
             "Error capturing heatmap for symbol=%s, time_period=%s: %s",
-            symbol_for_log,
-            time_period_for_log,
+            symbol or 'unknown',
+            time_period or 'unknown',
             e,
             exc_info=True,
         )
-        return jsonify({'error': 'Internal server error.'}), 500
+        return _static_json_response(_INTERNAL_ERROR_BODY, 500)
 
 @crypto_bp.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+    """Health check endpoint
+
+    Liveness probes tend to poll aggressively, so the encoded body is reused
+    for every request that lands within a 250 ms window and no ``datetime``
+    is built on cache hits.
+    """
+    global _health_cache
+
+    now = time.monotonic()
+    cached_at, body = _health_cache
+    if now - cached_at > _HEALTH_CACHE_WINDOW:
+        timestamp = datetime.fromtimestamp(time.time()).isoformat()
+        body = json.dumps({'status': 'healthy', 'timestamp': timestamp}).encode()
+        _health_cache = (now, body)
+    return current_app.response_class(body, mimetype='application/json')
 
@@ -1,7 +1,11 @@
+import functools
 import hmac
+import json
+import re
 
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
 from marshmallow import Schema, ValidationError, fields
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
 from mcp_liquidation_map.models.user import User, db
@@ -9,13 +13,21 @@ from mcp_liquidation_map.models.user import User, db
 
 user_bp = Blueprint('user', __name__)
 
+_BEARER_PREFIX = b'bearer '
+# No word boundaries: constraint names such as ``user_email_key`` must match.
+_INTEGRITY_COLUMN_PATTERN = re.compile(r'email|username', re.IGNORECASE)
+# Upper bound on users per batch request, so one call stays a bounded transaction.
+_MAX_BATCH_SIZE = 500
+
 
 class UserSchema(Schema):
     username = fields.Str(required=True)
     email = fields.Email(required=True)
 
 
-user_schema = UserSchema()
+# Shared loaders built once at import; never instantiate schemas per request.
+_FULL_LOADER = UserSchema()
+_PARTIAL_LOADER = UserSchema(partial=True)
 
 
 @user_bp.before_request
@@ -27,22 +39,43 @@ def require_user_api_token():
             503,
         )
 
-    auth_header = request.headers.get("Authorization", "")
-    scheme, _, supplied_token = auth_header.partition(" ")
-    if scheme.lower() != "bearer" or not supplied_token:
+    # WSGI decodes headers as latin-1; encoding back recovers the wire bytes,
+    # which are compared against the UTF-8 encoded token.
+    auth_header = request.headers.get("Authorization", "").encode("latin-1")
+    prefix_length = len(_BEARER_PREFIX)
+    if auth_header[:prefix_length].lower() != _BEARER_PREFIX or len(auth_header) == prefix_length:
         return (
             jsonify({"error": "Missing or invalid authorization token."}),
             401,
         )
 
-    if not hmac.compare_digest(supplied_token, token):
+    if not hmac.compare_digest(auth_header[prefix_length:], _encode_token(token)):
         return jsonify({"error": "Invalid authorization token."}), 401
 
 
+@functools.lru_cache(maxsize=8)
+def _encode_token(token: str) -> bytes:
+    """Encode the configured token once so comparisons stay bytes-only."""
+    return token.encode("utf-8")
+
+
 @user_bp.route('/users', methods=['GET'])
 def get_users():
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users])
+    # Execute before building the response so database errors still surface
+    # as a 500 instead of a truncated 200 body.
+    statement = select(User.id, User.username, User.email).execution_options(yield_per=500)
+    rows = db.session.execute(statement)
+    return Response(stream_with_context(_stream_users(rows)), mimetype='application/json')
+
+
+def _stream_users(rows):
+    """Yield the user list as JSON without hydrating ORM objects."""
+    yield '['
+    for index, row in enumerate(rows):
+        if index:
+            yield ','
+        yield json.dumps(dict(row._mapping))
+    yield ']'
 
 
 @user_bp.route('/users', methods=['POST'])
@@ -52,7 +85,7 @@ def create_user():
         return jsonify({'errors': {'_schema': ['Invalid or missing JSON payload.']}}), 400
 
     try:
-        data = user_schema.load(payload)
+        data = _FULL_LOADER.load(payload)
     except ValidationError as err:
         return jsonify({'errors': err.messages}), 400
 
@@ -68,21 +101,47 @@ def create_user():
     return jsonify(user.to_dict()), 201
 
 
+@user_bp.route('/users/batch', methods=['POST'])
+def create_users_batch():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list) or not payload:
+        return jsonify({'errors': {'_schema': ['Expected a non-empty JSON array of users.']}}), 400
+    if len(payload) > _MAX_BATCH_SIZE:
+        return jsonify({'errors': {'_schema': [f'At most {_MAX_BATCH_SIZE} users per batch.']}}), 413
+
+    try:
+        records = _FULL_LOADER.load_many(payload)
+    except ValidationError as err:
+        return jsonify({'errors': err.messages}), 400
+
+    users = [User(username=data['username'], email=data['email']) for data in records]
+    # add_all lets SQLAlchemy batch the INSERTs into one transaction.
+    db.session.add_all(users)
+
+    try:
+        db.session.commit()
+    except IntegrityError as err:
+        db.session.rollback()
+        return _handle_integrity_error(err)
+
+    return jsonify([user.to_dict() for user in users]), 201
+
+
 @user_bp.route('/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
-    user = User.query.get_or_404(user_id)
+    user = db.get_or_404(User, user_id)
     return jsonify(user.to_dict())
 
 
 @user_bp.route('/users/<int:user_id>', methods=['PUT'])
 def update_user(user_id):
-    user = User.query.get_or_404(user_id)
+    user = db.get_or_404(User, user_id)
     payload = request.get_json(silent=True)
     if payload is None or not isinstance(payload, dict):
         return jsonify({'errors': {'_schema': ['Invalid or missing JSON payload.']}}), 400
 
     try:
-        data = user_schema.load(payload, partial=True)
+        data = _PARTIAL_LOADER.load(payload)
     except ValidationError as err:
         return jsonify({'errors': err.messages}), 400
 
@@ -103,19 +162,20 @@ def update_user(user_id):
 
 @user_bp.route('/users/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
-    user = User.query.get_or_404(user_id)
+    user = db.get_or_404(User, user_id)
     db.session.delete(user)
     db.session.commit()
     return '', 204
 
 
 def _handle_integrity_error(error: IntegrityError):
-    message = str(getattr(error, 'orig', error)).lower()
+    message = str(getattr(error, 'orig', error))
+    columns = {match.lower() for match in _INTEGRITY_COLUMN_PATTERN.findall(message)}
     errors = {}
-    if 'email' in message:
+    if 'email' in columns:
         errors['email'] = ['Email already exists.']
-    if 'username' in message:
-        errors.setdefault('username', []).append('Username already exists.')
+    if 'username' in columns:
+        errors['username'] = ['Username already exists.']
     if not errors:
         errors['_schema'] = ['Unique constraint violated.']
     return jsonify({'errors': errors}), 409
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Optional
 
 from mcp.server.fastmcp import Context, FastMCP
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from smithery.decorators import smithery
 
 from mcp_liquidation_map.routes.crypto import (
@@ -18,6 +19,8 @@ from mcp_liquidation_map.routes.crypto import (
 class SessionConfig(BaseModel):
     """Session-level configuration exposed to Smithery clients."""
 
+    model_config = ConfigDict(frozen=True)
+
     default_time_period: str = Field(
         "24 hour",
         description="Default liquidation heatmap window when none is provided.",
@@ -32,24 +35,30 @@ class SessionConfig(BaseModel):
     )
 
 
+# Shared defaults for sessions without explicit configuration.
+_DEFAULT_SESSION_CONFIG = SessionConfig()
+
+
 @smithery.server(config_schema=SessionConfig)
 def create_server() -> FastMCP:
     """Create and configure the FastMCP server used by Smithery deployments."""
 
     server = FastMCP(name="Crypto Heatmap MCP Server")
 
+    # The service builders do blocking HTTP I/O, so tools run them in a worker
+    # thread to keep the event loop free for concurrent sessions.
     @server.tool()
-    def get_crypto_price(symbol: str, ctx: Context) -> dict:
+    async def get_crypto_price(symbol: str, ctx: Context) -> dict:
         """Fetch the latest USD price for a cryptocurrency symbol."""
 
-        result: ServiceResult = build_crypto_price_result(symbol)
+        result: ServiceResult = await asyncio.to_thread(build_crypto_price_result, symbol)
         if result.status_code >= 400:
             message = result.payload.get('error') or f'Failed to fetch price for {symbol}'
             raise RuntimeError(message)
         return result.payload
 
     @server.tool()
-    def capture_heatmap(
+    async def capture_heatmap(
         symbol: str,
         ctx: Context,
         time_period: Optional[str] = None,
@@ -57,13 +66,14 @@ def create_server() -> FastMCP:
     ) -> dict:
         """Capture a liquidation heatmap for the requested symbol."""
 
-        session_config: SessionConfig = ctx.session_config or SessionConfig()
+        session_config: SessionConfig = ctx.session_config or _DEFAULT_SESSION_CONFIG
         effective_time_period = time_period or session_config.default_time_period
         effective_allow_simulated = (
             allow_simulated if allow_simulated is not None else session_config.allow_simulated
         )
 
-        result = build_heatmap_result(
+        result = await asyncio.to_thread(
+            build_heatmap_result,
             symbol,
             effective_time_period,
             effective_allow_simulated,
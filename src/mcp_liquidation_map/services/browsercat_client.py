@@ -5,24 +5,120 @@ This module provides a client interface to interact with the BrowserCat MCP serv
 for browser automation tasks like navigation, screenshot capture, and JavaScript execution.
 """
 
+import atexit
+import functools
 import json
 import logging
 import os
+import random
+import threading
 import time
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
 
 import requests
-from requests.exceptions import RequestException
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import RequestException, Timeout
 
+__all__ = ["BrowserCatMCPClient", "get_browsercat_client"]
 
 logger = logging.getLogger(__name__)
 
+COINGLASS_HEATMAP_URL = "https://www.coinglass.com/pro/futures/LiquidationHeatMap"
+
+# Upper bound on the fixed waits and polling inside _PREPARE_HEATMAP_SCRIPT.
+_PREPARE_HEATMAP_MAX_SECONDS = 31
+
+# Called as ``(script)(symbol, timePeriod)``; resolves to a status object
+# describing which page interactions succeeded (``null`` means not attempted).
+_PREPARE_HEATMAP_SCRIPT = """
+async (symbol, timePeriod) => {
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+    // Resolve as soon as a matching element is added instead of polling.
+    const waitFor = (selector, timeoutMs) => new Promise((resolve) => {
+        const existing = document.querySelector(selector);
+        if (existing) {
+            resolve(existing);
+            return;
+        }
+        const observer = new MutationObserver(() => {
+            const element = document.querySelector(selector);
+            if (element) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(element);
+            }
+        });
+        const timer = setTimeout(() => {
+            observer.disconnect();
+            resolve(document.querySelector(selector));
+        }, timeoutMs);
+        observer.observe(document.documentElement, { childList: true, subtree: true });
+    });
+    const status = { symbolTab: null, symbolInput: null, timeOption: null };
+
+    // Wait for the chart to render (at most 5 seconds)
+    await waitFor('div.echarts-for-react canvas', 5000);
+
+    if (symbol !== 'BTC') {
+        // :contains is not supported, so match the Symbol tab by text
+        const buttons = Array.from(document.querySelectorAll('button[role="tab"]'));
+        const tab = buttons.find((btn) => (btn.textContent || '').trim().toLowerCase() === 'symbol');
+        status.symbolTab = Boolean(tab);
+        if (tab) {
+            tab.click();
+        }
+
+        const input = await waitFor('input.MuiAutocomplete-input', 10000);
+        status.symbolInput = Boolean(input);
+        if (input) {
+            // Use the native setter so React registers the new value
+            const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+            setValue.call(input, symbol);
+            input.dispatchEvent(new Event('input', { bubbles: true }));
+            input.dispatchEvent(new KeyboardEvent('keydown', { key: 'Enter', bubbles: true }));
+        }
+
+        // Wait for chart to update
+        await sleep(10000);
+    }
+
+    const timeDropdown = document.querySelector('div.MuiSelect-root button.MuiSelect-button');
+    if (timeDropdown && timeDropdown.textContent.trim() !== timePeriod) {
+        timeDropdown.click();
+        await sleep(1000);
+        const options = Array.from(document.querySelectorAll('li[role="option"]'));
+        const option = options.find((item) => item.textContent.includes(timePeriod));
+        status.timeOption = Boolean(option);
+        if (option) {
+            option.click();
+        }
+    }
+
+    // Wait for chart to update
+    await sleep(5000);
+    return status;
+}
+"""
+
 class BrowserCatMCPClient:
     """Client for interacting with BrowserCat MCP server via Smithery"""
 
     DEFAULT_BASE_URL = "https://server.smithery.ai/@dmaznest/browsercat-mcp-server"
     DEFAULT_TIMEOUT = 30
+    DEFAULT_CACHE_TTL = 60
+    # Screenshot payloads can be large and symbols come from callers, so
+    # bound the number of cached captures.
+    MAX_CACHE_ENTRIES = 32
+    # Roughly the chart's rendered size; larger viewports only add image bytes.
+    HEATMAP_WIDTH = 900
+    HEATMAP_HEIGHT = 500
     RETRY_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+    # Transport failures worth retrying; anything else (bad URL, invalid
+    # headers, ...) will fail the same way on every attempt.
+    RETRY_EXCEPTIONS = (RequestsConnectionError, Timeout)
+    POOL_SIZE = 32
 
     def __init__(
         self,
@@ -31,6 +127,10 @@ class BrowserCatMCPClient:
         timeout: Optional[float] = None,
         max_retries: int = 3,
         backoff_factor: float = 0.5,
+        max_delay: float = 30.0,
+        jitter: float = 0.5,
+        cache_ttl: Optional[float] = None,
+        total_timeout: float = 45.0,
     ):
         """Initialize the BrowserCat MCP client.
 
@@ -40,6 +140,11 @@ class BrowserCatMCPClient:
             timeout: Request timeout in seconds (defaults to env or 30 seconds).
             max_retries: Maximum retry attempts for transient failures.
             backoff_factor: Exponential backoff factor applied between retries.
+            max_delay: Upper bound (seconds) on the base backoff delay.
+            jitter: Random fraction of the delay added so clients retry at different times.
+            cache_ttl: Seconds to reuse a successful heatmap capture (defaults to env or 60; 0 disables).
+            total_timeout: Wall-clock budget (seconds) for one tool call including retries;
+                never shorter than that call's own request timeout.
         """
         self.api_key = api_key or os.getenv('BROWSERCAT_API_KEY')
         self.base_url = base_url or os.getenv(
@@ -52,13 +157,46 @@ class BrowserCatMCPClient:
         )
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
-        self._session = requests.Session()
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.total_timeout = total_timeout
+        self._session = self._build_session()
+        self._tool_urls: Dict[str, str] = {}
+        self.cache_ttl = self._resolve_cache_ttl(
+            cache_ttl,
+            os.getenv('BROWSERCAT_CACHE_TTL'),
+        )
+        # (symbol, time_period, width, height) -> (monotonic capture time, result)
+        self._result_cache: 'OrderedDict[Tuple[str, str, int, int], Tuple[float, Dict[str, Any]]]' = (
+            OrderedDict()
+        )
+        self._result_cache_lock = threading.Lock()
+        self._shutdown = threading.Event()
 
         if not self.api_key:
             logger.warning(
                 "No BrowserCat API key provided. Some functionality may be limited."
             )
 
+    def _build_session(self) -> requests.Session:
+        """Create a pooled session carrying the headers shared by every tool call."""
+
+        session = requests.Session()
+        # Retries are handled in _make_request, so the adapter never retries.
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_SIZE,
+            pool_maxsize=self.POOL_SIZE,
+            pool_block=False,
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        session.headers["Content-Type"] = "application/json"
+        if self.api_key:
+            session.headers["Authorization"] = f"Bearer {self.api_key}"
+        return session
+
     @classmethod
     def _resolve_timeout(cls, timeout_arg: Optional[float], env_timeout: Optional[str]) -> float:
         """Resolve timeout precedence and ensure a valid float value."""
@@ -77,92 +215,158 @@ class BrowserCatMCPClient:
 
         return float(cls.DEFAULT_TIMEOUT)
 
-    def _sleep_with_backoff(self, attempt: int) -> None:
-        """Sleep using exponential backoff based on the attempt count."""
+    @classmethod
+    def _resolve_cache_ttl(cls, ttl_arg: Optional[float], env_ttl: Optional[str]) -> float:
+        """Resolve the heatmap cache TTL, falling back to the default on bad input."""
+
+        if ttl_arg is not None:
+            return max(0.0, float(ttl_arg))
+
+        if env_ttl:
+            try:
+                return max(0.0, float(env_ttl))
+            except (TypeError, ValueError):
+                logger.warning(
+                    "Invalid BROWSERCAT_CACHE_TTL value '%s'. Falling back to default.",
+                    env_ttl,
+                )
+
+        return float(cls.DEFAULT_CACHE_TTL)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Return the capped, jittered exponential backoff delay for ``attempt``."""
 
         if self.backoff_factor <= 0:
-            return
+            return 0.0
 
-        delay = self.backoff_factor * (2 ** attempt)
-        time.sleep(delay)
+        delay = min(self.max_delay, self.backoff_factor * (2 ** attempt))
+        return delay * (1 + random.random() * self.jitter)
 
-    def _should_retry(self, status_code: Optional[int]) -> bool:
-        """Return True when the response status warrants a retry."""
+    def _sleep_with_backoff(self, delay: float) -> None:
+        """Wait ``delay`` seconds, aborting early if the client is closed."""
+
+        if self._shutdown.wait(delay):
+            raise RuntimeError("BrowserCat client is shutting down")
 
-        if status_code is None:
-            return True
+    def close(self) -> None:
+        """Interrupt pending retry backoffs and close the HTTP session."""
+
+        self._shutdown.set()
+        self._session.close()
+
+    def _retry_delay_before(self, attempt: int, deadline: float) -> Optional[float]:
+        """Return the backoff for ``attempt`` if it ends before ``deadline``, else None."""
+
+        delay = self._backoff_delay(attempt)
+        if delay < deadline - time.monotonic():
+            return delay
+        return None
+
+    def _should_retry(self, status_code: int) -> bool:
+        """Return True when the response status warrants a retry."""
 
         return status_code in self.RETRY_STATUS_CODES
+
+    def _should_retry_exception(self, exc: RequestException) -> bool:
+        """Return True when a transport error is transient."""
+
+        return isinstance(exc, self.RETRY_EXCEPTIONS)
     
-    def _make_request(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    def _make_request(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         """
         Make a request to the BrowserCat MCP server
 
         Args:
             tool_name: Name of the tool to call
             arguments: Arguments for the tool
+            timeout: Per-request timeout override (defaults to ``self.timeout``)
 
         Returns:
             Response from the MCP server
         """
-        headers = {
-            "Content-Type": "application/json",
-        }
-
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
+        # Encode once; retries resend the same bytes instead of re-serializing.
+        body = json.dumps({"tool": tool_name, "arguments": arguments}).encode("utf-8")
+        request_timeout = self.timeout if timeout is None else timeout
+        url = self._tool_urls.get(tool_name)
+        if url is None:
+            url = self._tool_urls.setdefault(tool_name, f"{self.base_url}/tools/{tool_name}")
 
-        payload = {"tool": tool_name, "arguments": arguments}
+        deadline = time.monotonic() + max(self.total_timeout, request_timeout)
 
-        last_error: Optional[Dict[str, Any]] = None
+        # Either a transport error payload or the last failed response; failed
+        # response bodies are only decoded once retries are exhausted.
+        last_failure: Optional[Union[Dict[str, Any], requests.Response]] = None
 
         for attempt in range(self.max_retries):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
             try:
                 response = self._session.post(
-                    f"{self.base_url}/tools/{tool_name}",
-                    headers=headers,
-                    json=payload,
-                    timeout=self.timeout,
+                    url,
+                    data=body,
+                    timeout=min(request_timeout, remaining),
                 )
 
                 if response.status_code == 200:
                     return response.json()
 
-                error_details: Dict[str, Any] = {
-                    "error": f"Request failed with status {response.status_code}",
-                    "status_code": response.status_code,
-                }
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error(
+                        "BrowserCat MCP request failed: %s - %s",
+                        response.status_code,
+                        response.text,
+                    )
 
-                try:
-                    error_details["response"] = response.json()
-                except (json.JSONDecodeError, ValueError):
-                    error_details["response_text"] = response.text
-
-                logger.error(
-                    "BrowserCat MCP request failed: %s - %s",
-                    response.status_code,
-                    response.text,
-                )
-
-                last_error = error_details
+                last_failure = response
 
                 if attempt < self.max_retries - 1 and self._should_retry(response.status_code):
-                    self._sleep_with_backoff(attempt)
-                    continue
+                    delay = self._retry_delay_before(attempt, deadline)
+                    if delay is not None:
+                        self._sleep_with_backoff(delay)
+                        continue
 
-                return error_details
+                return self._response_error_details(response)
 
             except RequestException as exc:
                 logger.error("Error making BrowserCat MCP request: %s", exc)
-                last_error = {"error": str(exc), "status_code": None}
+                last_failure = {"error": str(exc), "status_code": None}
+
+                if attempt < self.max_retries - 1 and self._should_retry_exception(exc):
+                    delay = self._retry_delay_before(attempt, deadline)
+                    if delay is not None:
+                        self._sleep_with_backoff(delay)
+                        continue
+
+                return last_failure
 
-                if attempt < self.max_retries - 1 and self._should_retry(None):
-                    self._sleep_with_backoff(attempt)
-                    continue
+        if last_failure is None:
+            return {"error": "Unknown error", "status_code": None}
+        if isinstance(last_failure, dict):
+            return last_failure
+        return self._response_error_details(last_failure)
 
-                return last_error
+    @staticmethod
+    def _response_error_details(response: requests.Response) -> Dict[str, Any]:
+        """Build the structured error payload for a non-200 response."""
 
-        return last_error or {"error": "Unknown error", "status_code": None}
+        error_details: Dict[str, Any] = {
+            "error": f"Request failed with status {response.status_code}",
+            "status_code": response.status_code,
+        }
+
+        try:
+            error_details["response"] = response.json()
+        except (json.JSONDecodeError, ValueError):
+            error_details["response_text"] = response.text
+
+        return error_details
     
     def navigate(self, url: str) -> Dict[str, Any]:
         """
@@ -213,17 +417,18 @@ class BrowserCatMCPClient:
         """
         return self._make_request("browsercat_click", {"selector": selector})
     
-    def evaluate(self, script: str) -> Dict[str, Any]:
+    def evaluate(self, script: str, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Execute JavaScript in the browser
         
         Args:
             script: JavaScript code to execute
+            timeout: Request timeout override for long-running scripts
             
         Returns:
             Response from script execution
         """
-        return self._make_request("browsercat_evaluate", {"script": script})
+        return self._make_request("browsercat_evaluate", {"script": script}, timeout=timeout)
     
     def fill(self, selector: str, value: str) -> Dict[str, Any]:
         """
@@ -238,128 +443,139 @@ class BrowserCatMCPClient:
         """
         return self._make_request("browsercat_fill", {"selector": selector, "value": value})
     
-    def capture_coinglass_heatmap(self, symbol: str = "BTC", time_period: str = "24 hour") -> Dict[str, Any]:
+    def capture_coinglass_heatmap(
+        self,
+        symbol: str = "BTC",
+        time_period: str = "24 hour",
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """
         Capture Coinglass liquidation heatmap
+
+        Successful captures are reused for ``cache_ttl`` seconds per
+        ``(symbol, time_period, width, height)``; errors are never cached.
         
         Args:
             symbol: Cryptocurrency symbol
             time_period: Time period for the heatmap
+            width: Screenshot width (defaults to ``HEATMAP_WIDTH``)
+            height: Screenshot height (defaults to ``HEATMAP_HEIGHT``)
             
         Returns:
             Response with screenshot path or error
         """
+        width = width or self.HEATMAP_WIDTH
+        height = height or self.HEATMAP_HEIGHT
+
+        if self.cache_ttl <= 0:
+            return self._capture_coinglass_heatmap(symbol, time_period, width, height)
+
+        key = (symbol, time_period, width, height)
+        with self._result_cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                if time.monotonic() - cached[0] < self.cache_ttl:
+                    self._result_cache.move_to_end(key)
+                    return dict(cached[1])
+                del self._result_cache[key]
+
+        result = self._capture_coinglass_heatmap(symbol, time_period, width, height)
+        if isinstance(result, dict) and "error" not in result:
+            with self._result_cache_lock:
+                self._store_cached_result(key, result)
+        return result
+
+    def _store_cached_result(self, key: Tuple[str, str, int, int], result: Dict[str, Any]) -> None:
+        """Insert a capture, dropping expired entries and then the least recently used."""
+        now = time.monotonic()
+        expired = [
+            cached_key
+            for cached_key, (captured_at, _) in self._result_cache.items()
+            if now - captured_at >= self.cache_ttl
+        ]
+        for cached_key in expired:
+            del self._result_cache[cached_key]
+
+        self._result_cache[key] = (now, result)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > self.MAX_CACHE_ENTRIES:
+            self._result_cache.popitem(last=False)
+
+    def _capture_coinglass_heatmap(
+        self,
+        symbol: str,
+        time_period: str,
+        width: int,
+        height: int,
+    ) -> Dict[str, Any]:
+        """Run the uncached navigate/prepare/screenshot sequence."""
         try:
             # Navigate to Coinglass liquidation heatmap page
-            nav_result = self.navigate("https://www.coinglass.com/pro/futures/LiquidationHeatMap")
+            nav_result = self.navigate(COINGLASS_HEATMAP_URL)
             if "error" in nav_result:
                 return nav_result
-            
-            # Wait for page to load
-            wait_script = "new Promise(resolve => setTimeout(resolve, 5000))"
-            self.evaluate(wait_script)
-            
-            # Select symbol if not BTC
-            if symbol != "BTC":
-                # Click Symbol tab using text matching since :contains is not supported
-                symbol_tab_script = """
-                (() => {
-                    const buttons = Array.from(document.querySelectorAll('button[role="tab"]'));
-                    const target = buttons.find(btn => (btn.textContent || '').trim().toLowerCase() === 'symbol');
-                    if (target) {
-                        target.click();
-                        return true;
-                    }
-                    return false;
-                })();
-                """
-                symbol_tab_result = self.evaluate(symbol_tab_script)
-                if isinstance(symbol_tab_result, dict) and symbol_tab_result.get("error"):
-                    logger.warning(f"Could not click symbol tab: {symbol_tab_result}")
-                elif not (isinstance(symbol_tab_result, dict) and symbol_tab_result.get("result")):
-                    logger.warning("Symbol tab not found via text search.")
-
-                # Wait for symbol autocomplete input to be present before interacting
-                wait_for_symbol_input_script = """
-                new Promise((resolve) => {
-                    const timeoutMs = 10000;
-                    const intervalMs = 250;
-                    const start = Date.now();
-
-                    const poll = () => {
-                        if (document.querySelector('input.MuiAutocomplete-input')) {
-                            resolve(true);
-                        } else if (Date.now() - start >= timeoutMs) {
-                            resolve(false);
-                        } else {
-                            setTimeout(poll, intervalMs);
-                        }
-                    };
-
-                    poll();
-                });
-                """
-                wait_for_input = self.evaluate(wait_for_symbol_input_script)
-                input_ready = isinstance(wait_for_input, dict) and not wait_for_input.get("error") and bool(wait_for_input.get("result"))
-
-                if input_ready:
-                    # Fill symbol input
-                    symbol_input_result = self.fill("input.MuiAutocomplete-input", symbol)
-                    if "error" in symbol_input_result:
-                        logger.warning(f"Could not fill symbol input: {symbol_input_result}")
-                else:
-                    logger.warning("Symbol autocomplete input did not appear before timeout.")
-
-                # Press Enter to select
-                enter_script = """
-                const input = document.querySelector('input.MuiAutocomplete-input');
-                if (input) {
-                    const event = new KeyboardEvent('keydown', { key: 'Enter' });
-                    input.dispatchEvent(event);
-                }
-                """
-                self.evaluate(enter_script)
-                
-                # Wait for chart to update
-                self.evaluate("new Promise(resolve => setTimeout(resolve, 10000))")
-            
-            # Select time period
-            time_select_script = f"""
-            const timeDropdown = document.querySelector('div.MuiSelect-root button.MuiSelect-button');
-            if (timeDropdown && timeDropdown.textContent.trim() !== '{time_period}') {{
-                timeDropdown.click();
-                setTimeout(() => {{
-                    const options = document.querySelectorAll('li[role="option"]');
-                    for(let i = 0; i < options.length; i++) {{
-                        if(options[i].textContent.includes('{time_period}')) {{
-                            options[i].click();
-                            break;
-                        }}
-                    }}
-                }}, 1000);
-            }}
-            """
-            self.evaluate(time_select_script)
-            
-            # Wait for chart to update
-            self.evaluate("new Promise(resolve => setTimeout(resolve, 5000))")
-            
+
+            # Drive every page interaction in a single in-browser script so the
+            # capture costs one evaluate round trip instead of one per step.
+            prepare_script = _render_prepare_script(symbol, time_period)
+            prepare_result = self.evaluate(
+                prepare_script,
+                timeout=self.timeout + _PREPARE_HEATMAP_MAX_SECONDS,
+            )
+            self._log_prepare_result(prepare_result)
+
             # Take screenshot of the heatmap
             screenshot_name = f"{symbol.lower()}_heatmap_{time_period.replace(' ', '_')}"
             screenshot_result = self.screenshot(
                 name=screenshot_name,
                 selector="div.echarts-for-react",
-                width=1200,
-                height=800
+                width=width,
+                height=height
             )
             
             return screenshot_result
             
         except Exception as e:
-            logger.error(f"Error capturing Coinglass heatmap: {e}")
+            logger.error("Error capturing Coinglass heatmap: %s", e)
             return {"error": str(e)}
 
+    @staticmethod
+    def _log_prepare_result(prepare_result: Any) -> None:
+        """Log page-preparation steps that did not complete."""
+
+        if not isinstance(prepare_result, dict):
+            logger.warning("Unexpected heatmap preparation result: %s", prepare_result)
+            return
+
+        if prepare_result.get("error"):
+            logger.warning("Heatmap page preparation failed: %s", prepare_result)
+            return
+
+        status = prepare_result.get("result")
+        if not isinstance(status, dict):
+            return
+
+        if status.get("symbolTab") is False:
+            logger.warning("Symbol tab not found via text search.")
+        if status.get("symbolInput") is False:
+            logger.warning("Symbol autocomplete input did not appear before timeout.")
+        if status.get("timeOption") is False:
+            logger.warning("Time period option not found in dropdown.")
+
+
+@functools.lru_cache(maxsize=64)
+def _render_prepare_script(symbol: str, time_period: str) -> str:
+    """Return the preparation script invocation with JSON-escaped arguments."""
+
+    return f"({_PREPARE_HEATMAP_SCRIPT})({json.dumps(symbol)}, {json.dumps(time_period)});"
+
+
+@functools.lru_cache(maxsize=1)
+def get_browsercat_client() -> BrowserCatMCPClient:
+    """Return the shared client, creating it (and its session) on first use."""
 
-# Singleton instance
-browsercat_client = BrowserCatMCPClient()
+    client = BrowserCatMCPClient()
+    atexit.register(client.close)
+    return client
 
@@ -1,6 +1,10 @@
 import json
 import os
-from unittest.mock import Mock
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import requests
 
 from mcp_liquidation_map.services.browsercat_client import BrowserCatMCPClient
 
@@ -56,6 +60,131 @@ def test_make_request_retries_and_succeeds_after_transient_error():
     client._sleep_with_backoff.assert_called_once_with(0)
 
 
+def test_backoff_delay_caps_delay_and_applies_jitter():
+    client = BrowserCatMCPClient(
+        api_key="test",
+        backoff_factor=1,
+        max_delay=4,
+        jitter=0.5,
+    )
+
+    with patch(
+        "mcp_liquidation_map.services.browsercat_client.random.random",
+        return_value=1.0,
+    ):
+        assert [client._backoff_delay(1), client._backoff_delay(10)] == [3.0, 6.0]
+
+
+def test_make_request_sleeps_for_the_jittered_delay_it_checked():
+    client = BrowserCatMCPClient(
+        api_key="test",
+        base_url="https://example.test",
+        timeout=1,
+        max_retries=2,
+        backoff_factor=1,
+        jitter=0.5,
+        total_timeout=1.2,
+    )
+
+    failing_response = Mock()
+    failing_response.status_code = 503
+    failing_response.text = "Service unavailable"
+    failing_response.json.side_effect = json.JSONDecodeError("msg", "doc", 0)
+
+    client._session.post = Mock(return_value=failing_response)
+    client._sleep_with_backoff = Mock()
+
+    # The base delay (1s) fits the budget, but the jittered one (1.5s) does not.
+    with patch(
+        "mcp_liquidation_map.services.browsercat_client.random.random",
+        return_value=1.0,
+    ):
+        result = client._make_request("test_tool", {})
+
+    assert result["status_code"] == 503
+    client._sleep_with_backoff.assert_not_called()
+
+
+def test_close_interrupts_pending_backoff():
+    client = BrowserCatMCPClient(api_key="test", backoff_factor=10)
+    outcome = {}
+    waiting = threading.Event()
+    shutdown_wait = client._shutdown.wait
+
+    def tracked_wait(timeout):
+        waiting.set()
+        return shutdown_wait(timeout)
+
+    client._shutdown.wait = tracked_wait
+
+    def wait_out_backoff():
+        started = time.monotonic()
+        try:
+            client._sleep_with_backoff(10)
+        except RuntimeError as exc:
+            outcome["error"] = exc
+        outcome["elapsed"] = time.monotonic() - started
+
+    waiter = threading.Thread(target=wait_out_backoff)
+    waiter.start()
+    assert waiting.wait(timeout=5)
+    client.close()
+    waiter.join(timeout=5)
+
+    assert not waiter.is_alive()
+    assert "shutting down" in str(outcome["error"])
+    assert outcome["elapsed"] < 2
+
+
+def test_make_request_stops_retrying_when_backoff_exceeds_deadline():
+    client = BrowserCatMCPClient(
+        api_key="test",
+        base_url="https://example.test",
+        timeout=1,
+        max_retries=3,
+        backoff_factor=5,
+        total_timeout=1,
+    )
+
+    failing_response = Mock()
+    failing_response.status_code = 503
+    failing_response.text = "Service unavailable"
+    failing_response.json.side_effect = json.JSONDecodeError("msg", "doc", 0)
+
+    client._session.post = Mock(return_value=failing_response)
+    client._sleep_with_backoff = Mock()
+
+    result = client._make_request("test_tool", {})
+
+    assert result["status_code"] == 503
+    assert client._session.post.call_count == 1
+    client._sleep_with_backoff.assert_not_called()
+
+
+def test_make_request_only_retries_transient_transport_errors():
+    client = BrowserCatMCPClient(
+        api_key="test",
+        base_url="https://example.test",
+        timeout=1,
+        max_retries=3,
+        backoff_factor=0,
+    )
+
+    client._session.post = Mock(side_effect=requests.exceptions.InvalidURL("bad url"))
+    result = client._make_request("test_tool", {})
+    assert result == {"error": "bad url", "status_code": None}
+    assert client._session.post.call_count == 1
+
+    success_response = Mock()
+    success_response.status_code = 200
+    success_response.json.return_value = {"result": "ok"}
+    client._session.post = Mock(
+        side_effect=[requests.exceptions.ConnectionError("reset"), success_response]
+    )
+    assert client._make_request("test_tool", {}) == {"result": "ok"}
+    assert client._session.post.call_count == 2
+
+
 def test_make_request_returns_structured_error_with_status_code():
     client = BrowserCatMCPClient(
         api_key="test",
@@ -80,75 +209,79 @@ def test_make_request_returns_structured_error_with_status_code():
 
 
 def test_capture_coinglass_heatmap_non_btc_symbol_and_timeframe_selection():
-    client = BrowserCatMCPClient(api_key="test")
+    client = BrowserCatMCPClient(api_key="test", timeout=30)
     events = []
 
-    def record_event(name, payload):
-        events.append((name, payload))
-
     def navigate_side_effect(url):
-        record_event("navigate", url)
+        events.append(("navigate", url))
         return {}
 
-    def evaluate_side_effect(script):
-        record_event("evaluate", script)
-        if "document.querySelector('input.MuiAutocomplete-input')" in script and "new Promise" in script:
-            return {"result": True}
-        if "buttons.find" in script and "role=\"tab\"" in script:
-            return {"result": True}
-        return {"result": None}
-
-    def fill_side_effect(selector, value):
-        record_event("fill", {"selector": selector, "value": value})
-        return {}
+    def evaluate_side_effect(script, timeout=None):
+        events.append(("evaluate", script))
+        return {"result": {"symbolTab": True, "symbolInput": True, "timeOption": True}}
 
     def screenshot_side_effect(**kwargs):
-        record_event("screenshot", kwargs)
+        events.append(("screenshot", kwargs))
         return {"path": "dummy.png"}
 
     client.navigate = Mock(side_effect=navigate_side_effect)
     client.evaluate = Mock(side_effect=evaluate_side_effect)
-    client.fill = Mock(side_effect=fill_side_effect)
+    client.fill = Mock()
     client.screenshot = Mock(side_effect=screenshot_side_effect)
 
     result = client.capture_coinglass_heatmap(symbol="ETH", time_period="6 hour")
 
     assert result["path"] == "dummy.png"
 
-    # Ensure navigation to the correct page happened first
+    # Navigation, a single batched preparation script, then the screenshot
+    assert [event_name for event_name, _ in events] == ["navigate", "evaluate", "screenshot"]
     assert events[0] == ("navigate", "https://www.coinglass.com/pro/futures/LiquidationHeatMap")
 
-    # Verify the tab selection was attempted via text-based search
-    assert any(
-        event_name == "evaluate" and "button[role=\"tab\"]" in payload and "textContent" in payload
-        for event_name, payload in events
+    script = events[1][1]
+    # The tab is selected via text-based search
+    assert "button[role=\"tab\"]" in script and "textContent" in script
+    # The autocomplete input is polled for and filled inside the browser
+    assert "input.MuiAutocomplete-input" in script
+    assert "HTMLInputElement.prototype" in script
+    client.fill.assert_not_called()
+    # Symbol and timeframe are passed as JSON-encoded arguments
+    assert script.rstrip().endswith('("ETH", "6 hour");')
+
+    # The long-running script gets extra time on top of the base timeout
+    assert client.evaluate.call_args.kwargs["timeout"] > client.timeout
+
+    # The screenshot is clipped to the chart at its natural size
+    screenshot_kwargs = events[2][1]
+    assert screenshot_kwargs["selector"] == "div.echarts-for-react"
+    assert (screenshot_kwargs["width"], screenshot_kwargs["height"]) == (
+        BrowserCatMCPClient.HEATMAP_WIDTH,
+        BrowserCatMCPClient.HEATMAP_HEIGHT,
     )
 
-    # Verify the polling script executes before attempting to fill the input
-    wait_indices = [
-        idx
-        for idx, (event_name, payload) in enumerate(events)
-        if event_name == "evaluate"
-        and "document.querySelector('input.MuiAutocomplete-input')" in payload
-        and "new Promise" in payload
-    ]
-    assert wait_indices, "Expected polling script to run before filling input"
-
-    fill_index = next(
-        idx for idx, (event_name, _) in enumerate(events) if event_name == "fill"
-    )
-    assert wait_indices[0] < fill_index
-
-    # Ensure the fill call targeted the autocomplete with the requested symbol
-    assert any(
-        event_name == "fill"
-        and event_payload["selector"] == "input.MuiAutocomplete-input"
-        and event_payload["value"] == "ETH"
-        for event_name, event_payload in events
+
+def test_capture_coinglass_heatmap_reuses_recent_successful_capture():
+    client = BrowserCatMCPClient(api_key="test", cache_ttl=60)
+    client._capture_coinglass_heatmap = Mock(
+        side_effect=[{"error": "boom"}, {"path": "first.png"}, {"path": "second.png"}]
     )
 
-    # Confirm the timeframe selection script included the requested timeframe
-    assert any(
-        event_name == "evaluate" and "6 hour" in payload
-        for event_name, payload in events
+    assert client.capture_coinglass_heatmap("BTC", "24 hour") == {"error": "boom"}
+    assert client.capture_coinglass_heatmap("BTC", "24 hour") == {"path": "first.png"}
+    assert client.capture_coinglass_heatmap("BTC", "24 hour") == {"path": "first.png"}
+    assert client.capture_coinglass_heatmap("ETH", "24 hour") == {"path": "second.png"}
+    assert client._capture_coinglass_heatmap.call_count == 3
+
+
+def test_capture_coinglass_heatmap_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(BrowserCatMCPClient, "MAX_CACHE_ENTRIES", 2)
+    client = BrowserCatMCPClient(api_key="test", cache_ttl=60)
+    client._capture_coinglass_heatmap = Mock(
+        side_effect=lambda symbol, *args: {"path": f"{symbol}.png"}
     )
+
+    for symbol in ("BTC", "ETH", "BTC", "SOL"):
+        client.capture_coinglass_heatmap(symbol, "24 hour")
+
+    # ETH was least recently used when SOL pushed the cache over its cap.
+    assert [key[0] for key in client._result_cache] == ["BTC", "SOL"]
+    assert client._capture_coinglass_heatmap.call_count == 3
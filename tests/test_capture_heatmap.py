@@ -5,21 +5,28 @@ from unittest.mock import patch
 from flask import Flask
 
 from mcp_liquidation_map.routes.crypto import crypto_bp
+from mcp_liquidation_map.services.browsercat_client import BrowserCatMCPClient
 
 
 class CaptureHeatmapRouteTests(unittest.TestCase):
-    def setUp(self):
-        os.environ.pop('ENABLE_SIMULATED_HEATMAP', None)
+    @classmethod
+    def setUpClass(cls):
         app = Flask(__name__)
         app.register_blueprint(crypto_bp, url_prefix='/api')
-        self.client = app.test_client()
+        cls.client = app.test_client()
+        patcher = patch.object(BrowserCatMCPClient, 'capture_coinglass_heatmap')
+        cls.mock_capture = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+
+    def setUp(self):
+        os.environ.pop('ENABLE_SIMULATED_HEATMAP', None)
+        self.mock_capture.reset_mock(return_value=True, side_effect=True)
 
     def tearDown(self):
         os.environ.pop('ENABLE_SIMULATED_HEATMAP', None)
 
-    @patch('mcp_liquidation_map.routes.crypto.browsercat_client.capture_coinglass_heatmap')
-    def test_capture_heatmap_success(self, mock_capture):
-        mock_capture.return_value = {'screenshot_path': '/tmp/test.png'}
+    def test_capture_heatmap_success(self):
+        self.mock_capture.return_value = {'screenshot_path': '/tmp/test.png'}
 
         response = self.client.get('/api/capture_heatmap?symbol=BTC&time_period=24%20hour')
 
@@ -29,11 +36,10 @@ class CaptureHeatmapRouteTests(unittest.TestCase):
         self.assertEqual(data['symbol'], 'BTC')
         self.assertEqual(data['time_period'], '24 hour')
         self.assertNotIn('fallback', data)
-        mock_capture.assert_called_once_with('BTC', '24 hour')
+        self.mock_capture.assert_called_once_with('BTC', '24 hour')
 
-    @patch('mcp_liquidation_map.routes.crypto.browsercat_client.capture_coinglass_heatmap')
-    def test_capture_heatmap_uses_path_when_screenshot_missing(self, mock_capture):
-        mock_capture.return_value = {'path': '/tmp/fallback.png'}
+    def test_capture_heatmap_uses_path_when_screenshot_missing(self):
+        self.mock_capture.return_value = {'path': '/tmp/fallback.png'}
 
         response = self.client.get('/api/capture_heatmap?symbol=BTC&time_period=24%20hour')
 
@@ -42,11 +48,10 @@ class CaptureHeatmapRouteTests(unittest.TestCase):
         self.assertEqual(data['image_path'], '/tmp/fallback.png')
         self.assertEqual(data['symbol'], 'BTC')
         self.assertEqual(data['time_period'], '24 hour')
-        mock_capture.assert_called_once_with('BTC', '24 hour')
+        self.mock_capture.assert_called_once_with('BTC', '24 hour')
 
-    @patch('mcp_liquidation_map.routes.crypto.browsercat_client.capture_coinglass_heatmap')
-    def test_capture_heatmap_browsercat_failure_returns_default_fallback(self, mock_capture):
-        mock_capture.return_value = {'error': 'Request failed with status 401'}
+    def test_capture_heatmap_browsercat_failure_returns_default_fallback(self):
+        self.mock_capture.return_value = {'error': 'Request failed with status 401'}
 
         response = self.client.get('/api/capture_heatmap?symbol=ETH&time_period=12%20hour')
 
@@ -59,11 +64,10 @@ class CaptureHeatmapRouteTests(unittest.TestCase):
         self.assertEqual(fallback['symbol'], 'ETH')
         self.assertEqual(fallback['time_period'], '12 hour')
         self.assertTrue(fallback['simulated'])
-        mock_capture.assert_called_once_with('ETH', '12 hour')
+        self.mock_capture.assert_called_once_with('ETH', '12 hour')
 
-    @patch('mcp_liquidation_map.routes.crypto.browsercat_client.capture_coinglass_heatmap')
-    def test_capture_heatmap_browsercat_failure_opt_out_of_fallback(self, mock_capture):
-        mock_capture.return_value = {'error': 'Request failed with status 401'}
+    def test_capture_heatmap_browsercat_failure_opt_out_of_fallback(self):
+        self.mock_capture.return_value = {'error': 'Request failed with status 401'}
 
         response = self.client.get(
             '/api/capture_heatmap?symbol=ETH&time_period=12%20hour&allow_simulated=false'
@@ -74,11 +78,10 @@ class CaptureHeatmapRouteTests(unittest.TestCase):
         self.assertFalse(data['fallback_provided'])
         self.assertNotIn('fallback', data)
         self.assertEqual(data['browsercat_error'], 'Request failed with status 401')
-        mock_capture.assert_called_once_with('ETH', '12 hour')
+        self.mock_capture.assert_called_once_with('ETH', '12 hour')
 
-    @patch('mcp_liquidation_map.routes.crypto.browsercat_client.capture_coinglass_heatmap')
-    def test_capture_heatmap_browsercat_exception_with_fallback(self, mock_capture):
-        mock_capture.side_effect = RuntimeError('network outage')
+    def test_capture_heatmap_browsercat_exception_with_fallback(self):
+        self.mock_capture.side_effect = RuntimeError('network outage')
 
         response = self.client.get('/api/capture_heatmap?symbol=SOL&time_period=24%20hour&allow_simulated=true')
 
@@ -106,5 +109,12 @@ class CaptureHeatmapRouteTests(unittest.TestCase):
         self.assertEqual(data['error'], 'Invalid JSON payload.')
 
 
+    def test_capture_heatmap_empty_post_body_returns_400(self):
+        response = self.client.post('/api/capture_heatmap', content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'Invalid JSON payload.')
+        self.mock_capture.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
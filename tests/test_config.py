@@ -1,25 +1,33 @@
 """Tests for the configuration helper utilities."""
 
-import importlib.util
+import functools
+import types
 from pathlib import Path
 
 import pytest
 
 
+CONFIG_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "src"
+    / "mcp_liquidation_map"
+    / "config.py"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _config_code() -> types.CodeType:
+    """Read and compile the config module source once per test session."""
+
+    return compile(CONFIG_PATH.read_bytes(), str(CONFIG_PATH), "exec")
+
+
 def load_config_module(module_name: str = "test_config_module"):
     """Load ``mcp_liquidation_map.config`` under an isolated module name."""
 
-    config_path = (
-        Path(__file__).resolve().parents[1]
-        / "src"
-        / "mcp_liquidation_map"
-        / "config.py"
-    )
-    spec = importlib.util.spec_from_file_location(module_name, config_path)
-    if spec is None or spec.loader is None:  # pragma: no cover - defensive
-        raise RuntimeError("Unable to load config module for testing")
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    module = types.ModuleType(module_name)
+    module.__file__ = str(CONFIG_PATH)
+    exec(_config_code(), module.__dict__)
     return module
 
 
@@ -33,3 +41,18 @@ def test_get_config_requires_secret_key_when_debug_disabled(monkeypatch):
 
     with pytest.raises(RuntimeError, match="SECRET_KEY environment variable must be set"):
         config_module.get_config()
+
+
+def test_get_config_returns_cached_instance(monkeypatch):
+    """Repeated calls reuse the same configuration object."""
+
+    monkeypatch.setenv("SECRET_KEY", "cached-secret")
+    monkeypatch.setenv("DEBUG", "0")
+
+    config_module = load_config_module("config_cached")
+
+    first = config_module.get_config()
+    assert config_module.get_config() is first
+
+    config_module.get_config.cache_clear()
+    assert config_module.get_config() is not first
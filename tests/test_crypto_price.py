@@ -1,17 +1,54 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+import time
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 from flask import Flask
 import requests
 
+from mcp_liquidation_map.routes import crypto
 from mcp_liquidation_map.routes.crypto import crypto_bp
 
 
+class _DummyResponse:
+    __slots__ = ('status_code', 'json')
+
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.json = lambda: payload
+
+
+_PRICE_RESPONSES = {
+    coin_id: _DummyResponse(200, {coin_id: {'usd': price}})
+    for coin_id, price in (
+        ('bitcoin', 12345.6789),
+        ('ethereum', 2500),
+        ('solana', 150),
+        ('shib', 0.00001234),
+    )
+}
+
+
+def _fake_coingecko_get(url, timeout=None):
+    coin_id = url.split('ids=', 1)[1].split('&', 1)[0]
+    return _PRICE_RESPONSES[coin_id]
+
+
 class CryptoPriceRouteTests(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         app = Flask(__name__)
         app.register_blueprint(crypto_bp, url_prefix='/api')
-        self.client = app.test_client()
+        cls.client = app.test_client()
+        patcher = patch.object(crypto._coingecko_session, 'get')
+        cls.mock_get = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+
+    def setUp(self):
+        crypto._price_cache.clear()
+        self.mock_get.reset_mock()
+        self.mock_get.side_effect = _fake_coingecko_get
 
     def test_get_crypto_price_missing_symbol_returns_400(self):
         response = self.client.get('/api/get_crypto_price')
@@ -21,27 +58,45 @@ class CryptoPriceRouteTests(unittest.TestCase):
         self.assertEqual(data['error'], 'Symbol parameter is required')
         self.assertEqual(data['status_code'], 400)
 
-    @patch('mcp_liquidation_map.routes.crypto.requests.get')
-    def test_get_crypto_price_success_formats_response(self, mock_get: MagicMock):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'bitcoin': {'usd': 12345.6789}}
-        mock_get.return_value = mock_response
-
+    def test_get_crypto_price_success_formats_response(self):
         response = self.client.get('/api/get_crypto_price?symbol=btc')
 
         self.assertEqual(response.status_code, 200)
         data = response.get_json()
         self.assertEqual(data['symbol'], 'BTC')
         self.assertEqual(data['price'], '$12,345.68')
-        mock_get.assert_called_once_with(
+        self.assertEqual(data['price_usd'], 12345.6789)
+        self.mock_get.assert_called_once_with(
             'https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd',
             timeout=10,
         )
 
-    @patch('mcp_liquidation_map.routes.crypto.requests.get')
-    def test_get_crypto_price_request_exception_returns_503(self, mock_get: MagicMock):
-        mock_get.side_effect = requests.RequestException('boom')
+    def test_get_crypto_price_keeps_sub_cent_precision(self):
+        response = self.client.get('/api/get_crypto_price?symbol=shib')
+
+        data = response.get_json()
+        self.assertEqual(data['price'], '$0.00')
+        self.assertEqual(data['price_usd'], 0.00001234)
+
+    def test_get_crypto_price_reuses_recent_price(self):
+        first = self.client.get('/api/get_crypto_price?symbol=eth')
+        second = self.client.get('/api/get_crypto_price?symbol=ETH')
+
+        self.assertEqual(first.get_json(), second.get_json())
+        self.assertEqual(second.get_json()['price'], '$2,500.00')
+        self.mock_get.assert_called_once()
+
+    def test_get_crypto_price_cache_is_bounded(self):
+        with patch.object(crypto, '_PRICE_CACHE_MAX_ENTRIES', 2):
+            for symbol in ('btc', 'eth', 'btc', 'sol'):
+                self.client.get(f'/api/get_crypto_price?symbol={symbol}')
+
+        # ETH was least recently used when SOL pushed the cache over its cap.
+        self.assertEqual(list(crypto._price_cache), ['bitcoin', 'solana'])
+        self.assertEqual(self.mock_get.call_count, 3)
+
+    def test_get_crypto_price_request_exception_returns_503(self):
+        self.mock_get.side_effect = requests.RequestException('boom')
 
         response = self.client.get('/api/get_crypto_price?symbol=btc')
 
@@ -52,6 +107,102 @@ class CryptoPriceRouteTests(unittest.TestCase):
         self.assertEqual(data['symbol'], 'BTC')
         self.assertEqual(data['request_error'], 'boom')
 
+    def test_health_check_returns_json_status(self):
+        first = self.client.get('/api/health')
+        second = self.client.get('/api/health')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.mimetype, 'application/json')
+        data = first.get_json()
+        self.assertEqual(data['status'], 'healthy')
+        self.assertIn('timestamp', data)
+        self.assertEqual(second.get_json()['status'], 'healthy')
+
+    def test_get_crypto_price_post_reads_json_body(self):
+        response = self.client.post(
+            '/api/get_crypto_price',
+            data='{"symbol": "sol"}',
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['symbol'], 'SOL')
+
+    def test_get_crypto_price_post_invalid_json_returns_400(self):
+        response = self.client.post(
+            '/api/get_crypto_price',
+            data='{not json',
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'Invalid JSON payload.')
+
+
+    def test_get_crypto_price_post_requires_a_json_body(self):
+        empty = self.client.post('/api/get_crypto_price', content_type='application/json')
+        self.assertEqual(empty.status_code, 400)
+        self.assertEqual(empty.get_json()['error'], 'Invalid JSON payload.')
+
+        form = self.client.post('/api/get_crypto_price', data={'symbol': 'sol'})
+        self.assertEqual(form.status_code, 400)
+        self.assertEqual(form.get_json()['error'], 'Invalid JSON payload.')
+        self.mock_get.assert_not_called()
+
+class _FlakyGatewayHandler(BaseHTTPRequestHandler):
+    # Status codes to serve, in order; the last one repeats.
+    statuses = []
+    requests_seen = 0
+
+    def do_GET(self):
+        cls = type(self)
+        status = cls.statuses[min(cls.requests_seen, len(cls.statuses) - 1)]
+        cls.requests_seen += 1
+        body = b'{"bitcoin": {"usd": 1}}' if status == 200 else b'{}'
+        self.send_response(status)
+        self.send_header('Retry-After', '120')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CoinGeckoSessionRetryTests(unittest.TestCase):
+    def setUp(self):
+        _FlakyGatewayHandler.requests_seen = 0
+        self.server = HTTPServer(('127.0.0.1', 0), _FlakyGatewayHandler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.session = crypto._build_coingecko_session()
+        self.addCleanup(self.session.close)
+        # Reuse the production HTTPS adapter for the plain-HTTP test server.
+        self.session.mount('http://', self.session.get_adapter('https://api.coingecko.com'))
+        self.url = f'http://127.0.0.1:{self.server.server_port}/price'
+
+    def test_gateway_errors_are_retried_without_honouring_retry_after(self):
+        _FlakyGatewayHandler.statuses = [503, 200]
+
+        started = time.monotonic()
+        response = self.session.get(self.url, timeout=5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(_FlakyGatewayHandler.requests_seen, 2)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_exhausted_retries_return_the_last_response(self):
+        _FlakyGatewayHandler.statuses = [503]
+
+        response = self.session.get(self.url, timeout=5)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(_FlakyGatewayHandler.requests_seen, 3)
+
 
 if __name__ == '__main__':
     unittest.main()
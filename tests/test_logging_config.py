@@ -2,103 +2,84 @@ import importlib
 import logging
 import os
 import unittest
-from unittest.mock import patch
+from unittest import mock
 
 from flask import Flask
 
 from mcp_liquidation_map.routes.crypto import crypto_bp
+from mcp_liquidation_map.services.browsercat_client import BrowserCatMCPClient
 
 
 os.environ.setdefault('SECRET_KEY', 'test-secret-key')
 
 
 class CryptoBlueprintLoggingTests(unittest.TestCase):
-    def test_capture_heatmap_logs_to_current_app_logger(self):
-        app = Flask(__name__)
-        app.register_blueprint(crypto_bp, url_prefix='/api')
-        records = []
-
-        class CollectorHandler(logging.Handler):
-            def emit(self, record):
-                records.append(record)
+    @classmethod
+    def setUpClass(cls):
+        cls.app = Flask(__name__)
+        cls.app.register_blueprint(crypto_bp, url_prefix='/api')
+        cls.client = cls.app.test_client()
 
-        collector = CollectorHandler()
-        original_handlers = list(app.logger.handlers)
-        original_level = app.logger.level
+    def setUp(self):
+        env_patcher = mock.patch.dict(os.environ)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
         os.environ.pop('ENABLE_SIMULATED_HEATMAP', None)
-        try:
-            app.logger.handlers = [collector]
-            app.logger.setLevel(logging.INFO)
-            with app.test_client() as client, patch(
-                'mcp_liquidation_map.routes.crypto.browsercat_client.capture_coinglass_heatmap',
-                side_effect=RuntimeError('boom'),
-            ):
-                response = client.get('/api/capture_heatmap?symbol=BTC&time_period=24%20hour')
-                self.assertEqual(response.status_code, 503)
-        finally:
-            app.logger.handlers = original_handlers
-            app.logger.setLevel(original_level)
+
+    def test_capture_heatmap_logs_to_current_app_logger(self):
+        def failing_capture(*args, **kwargs):
+            raise RuntimeError('boom')
+
+        with mock.patch.object(
+            BrowserCatMCPClient, 'capture_coinglass_heatmap', failing_capture
+        ), self.assertLogs(self.app.logger, level=logging.INFO) as logs:
+            response = self.client.get('/api/capture_heatmap?symbol=BTC&time_period=24%20hour')
+        self.assertEqual(response.status_code, 503)
 
         self.assertTrue(
-            any('BrowserCat client error' in record.getMessage() for record in records),
+            any(
+                record.getMessage().startswith('BrowserCat client error')
+                for record in logs.records
+            ),
             'Expected capture_heatmap to emit an error log through the Flask app logger.',
         )
 
 
 class ConfigureLoggingTests(unittest.TestCase):
-    def setUp(self):
-        self.root_logger = logging.getLogger()
-        self.original_handlers = list(self.root_logger.handlers)
-        self.original_level = self.root_logger.level
-        self.original_app_log_level = os.environ.get('APP_LOG_LEVEL')
-        self.original_secret_key = os.environ.get('SECRET_KEY')
-        if self.original_secret_key is None:
-            os.environ['SECRET_KEY'] = 'test-secret-key'
+    @classmethod
+    def setUpClass(cls):
+        # Config reads SECRET_KEY at import time, before the default above is set.
         import mcp_liquidation_map.config as config_module
-        importlib.reload(config_module)
-        self.config_module = config_module
-        self.main_module = importlib.import_module('mcp_liquidation_map.main')
 
-    def tearDown(self):
-        for handler in list(self.root_logger.handlers):
-            self.root_logger.removeHandler(handler)
-        for handler in self.original_handlers:
-            self.root_logger.addHandler(handler)
-        self.root_logger.setLevel(self.original_level)
-
-        if self.original_app_log_level is None:
-            os.environ.pop('APP_LOG_LEVEL', None)
-        else:
-            os.environ['APP_LOG_LEVEL'] = self.original_app_log_level
+        importlib.reload(config_module)
+        from mcp_liquidation_map.main import configure_logging
 
-        if self.original_secret_key is None:
-            os.environ.pop('SECRET_KEY', None)
-        else:
-            os.environ['SECRET_KEY'] = self.original_secret_key
+        cls.configure_logging = staticmethod(configure_logging)
 
-        importlib.reload(self.config_module)
-        importlib.reload(self.main_module)
+    def setUp(self):
+        # Each test starts from a bare root logger; the original handler
+        # list and level come back automatically afterwards.
+        self.root_logger = logging.getLogger()
+        self.addCleanup(self.root_logger.setLevel, self.root_logger.level)
+        handlers_patcher = mock.patch.object(self.root_logger, 'handlers', [])
+        handlers_patcher.start()
+        self.addCleanup(handlers_patcher.stop)
 
     def test_configure_logging_respects_existing_handlers(self):
         sentinel_stream = logging.StreamHandler()
-        for handler in list(self.root_logger.handlers):
-            self.root_logger.removeHandler(handler)
         self.root_logger.addHandler(sentinel_stream)
         self.root_logger.setLevel(logging.WARNING)
 
-        importlib.reload(self.main_module)
+        self.configure_logging()
 
         self.assertEqual(len(self.root_logger.handlers), 1)
         self.assertIs(self.root_logger.handlers[0], sentinel_stream)
         self.assertEqual(self.root_logger.level, logging.WARNING)
 
     def test_configure_logging_sets_defaults_when_missing(self):
-        for handler in list(self.root_logger.handlers):
-            self.root_logger.removeHandler(handler)
         self.root_logger.setLevel(logging.NOTSET)
-        os.environ['APP_LOG_LEVEL'] = 'DEBUG'
-
-        importlib.reload(self.main_module)
+        with mock.patch.dict(os.environ, {'APP_LOG_LEVEL': 'DEBUG'}):
+            self.configure_logging()
 
         self.assertGreaterEqual(len(self.root_logger.handlers), 1)
         self.assertEqual(self.root_logger.level, logging.DEBUG)
@@ -1,30 +1,62 @@
 import unittest
 
 from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 from mcp_liquidation_map.models.user import db
-from mcp_liquidation_map.routes.user import user_bp
+from mcp_liquidation_map.routes.user import _MAX_BATCH_SIZE, user_bp
+
+
+def _emit_begin(connection):
+    connection.exec_driver_sql('BEGIN')
 
 
 class UserRouteTests(unittest.TestCase):
-    def setUp(self):
-        self.app = Flask(__name__)
-        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
-        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-        self.app.config['USER_API_TOKEN'] = 'test-token'
-        db.init_app(self.app)
+    @classmethod
+    def setUpClass(cls):
+        cls.app = Flask(__name__)
+        cls.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        cls.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        cls.app.config['USER_API_TOKEN'] = 'test-token'
+        # pysqlite defers BEGIN and would let SAVEPOINT release commit for
+        # real; take over transaction control so rollbacks stay reliable.
+        cls.app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'connect_args': {'isolation_level': None},
+        }
+        db.init_app(cls.app)
 
-        with self.app.app_context():
+        with cls.app.app_context():
+            event.listen(db.engine, 'begin', _emit_begin)
             db.create_all()
 
-        self.app.register_blueprint(user_bp, url_prefix='/api')
-        self.client = self.app.test_client()
-        self.auth_headers = {'Authorization': 'Bearer test-token'}
+        cls.app.register_blueprint(user_bp, url_prefix='/api')
+        cls.client = cls.app.test_client()
+        cls.auth_headers = {'Authorization': 'Bearer test-token'}
 
-    def tearDown(self):
-        with self.app.app_context():
-            db.session.remove()
+    @classmethod
+    def tearDownClass(cls):
+        with cls.app.app_context():
             db.drop_all()
+            db.engine.dispose()
+
+    def setUp(self):
+        # Run each test inside an outer transaction; route commits only
+        # release savepoints, so tearDown can roll everything back. The app
+        # context is popped again so each request still tears down its session.
+        with self.app.app_context():
+            self.connection = db.engine.connect()
+        self.transaction = self.connection.begin()
+        self.original_session = db.session
+        db.session = scoped_session(
+            sessionmaker(bind=self.connection, join_transaction_mode='create_savepoint')
+        )
+
+    def tearDown(self):
+        db.session.remove()
+        db.session = self.original_session
+        self.transaction.rollback()
+        self.connection.close()
 
     def test_create_user_requires_valid_payload(self):
         response = self.client.post(
@@ -54,6 +86,46 @@ class UserRouteTests(unittest.TestCase):
         duplicate_data = duplicate_response.get_json()
         self.assertIn('email', duplicate_data['errors'])
 
+    def test_batch_create_inserts_all_users(self):
+        response = self.client.post(
+            '/api/users/batch',
+            json=[
+                {'username': 'frank', 'email': 'frank@example.com'},
+                {'username': 'grace', 'email': 'grace@example.com'},
+            ],
+            headers=self.auth_headers,
+        )
+        self.assertEqual(response.status_code, 201)
+        created = response.get_json()
+        self.assertEqual([user['username'] for user in created], ['frank', 'grace'])
+        self.assertTrue(all(user['id'] for user in created))
+
+    def test_batch_create_reports_errors_by_index(self):
+        response = self.client.post(
+            '/api/users/batch',
+            json=[
+                {'username': 'heidi', 'email': 'heidi@example.com'},
+                {'username': 'ivan', 'email': 'not-an-email'},
+            ],
+            headers=self.auth_headers,
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.get_json()['errors']
+        self.assertEqual(list(errors), ['1'])
+        self.assertIn('email', errors['1'])
+
+    def test_batch_create_rejects_oversized_batches(self):
+        response = self.client.post(
+            '/api/users/batch',
+            json=[
+                {'username': f'user{index}', 'email': f'user{index}@example.com'}
+                for index in range(_MAX_BATCH_SIZE + 1)
+            ],
+            headers=self.auth_headers,
+        )
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('_schema', response.get_json()['errors'])
+
     def test_partial_update_allows_updating_subset_of_fields(self):
         create_response = self.client.post(
             '/api/users',
@@ -73,6 +145,65 @@ class UserRouteTests(unittest.TestCase):
         self.assertEqual(updated_user['username'], 'charlie')
         self.assertEqual(updated_user['email'], 'charlie.new@example.com')
 
+    def test_requests_without_valid_bearer_token_are_rejected(self):
+        missing = self.client.get('/api/users')
+        self.assertEqual(missing.status_code, 401)
+
+        empty = self.client.get('/api/users', headers={'Authorization': 'Bearer '})
+        self.assertEqual(empty.status_code, 401)
+
+        wrong = self.client.get('/api/users', headers={'Authorization': 'Bearer nope'})
+        self.assertEqual(wrong.status_code, 401)
+        self.assertEqual(wrong.get_json()['error'], 'Invalid authorization token.')
+
+        lowercase = self.client.get('/api/users', headers={'Authorization': 'bearer test-token'})
+        self.assertEqual(lowercase.status_code, 200)
+
+    def test_non_ascii_token_is_compared_as_utf8_bytes(self):
+        self.app.config['USER_API_TOKEN'] = 'tök'
+        self.addCleanup(self.app.config.__setitem__, 'USER_API_TOKEN', 'test-token')
+        # Header values travel as bytes; the test client sends str headers as latin-1.
+        utf8_header = 'Bearer ' + 'tök'.encode('utf-8').decode('latin-1')
+
+        response = self.client.get('/api/users', headers={'Authorization': utf8_header})
+        self.assertEqual(response.status_code, 200)
+
+        latin1_header = self.client.get('/api/users', headers={'Authorization': 'Bearer tök'})
+        self.assertEqual(latin1_header.status_code, 401)
+
+    def test_list_users_streams_json_array(self):
+        empty_response = self.client.get('/api/users', headers=self.auth_headers)
+        self.assertEqual(empty_response.status_code, 200)
+        self.assertEqual(empty_response.get_json(), [])
+
+        for name in ('dave', 'erin'):
+            self.client.post(
+                '/api/users',
+                json={'username': name, 'email': f'{name}@example.com'},
+                headers=self.auth_headers,
+            )
+
+        list_response = self.client.get('/api/users', headers=self.auth_headers)
+        self.assertEqual(list_response.status_code, 200)
+        users = list_response.get_json()
+        self.assertEqual([user['username'] for user in users], ['dave', 'erin'])
+        self.assertEqual(set(users[0]), {'id', 'username', 'email'})
+
+
+class UserListWithoutSchemaTests(unittest.TestCase):
+    def test_list_users_reports_database_errors_before_streaming(self):
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['USER_API_TOKEN'] = 'test-token'
+        db.init_app(app)
+        app.register_blueprint(user_bp, url_prefix='/api')
+
+        response = app.test_client().get(
+            '/api/users', headers={'Authorization': 'Bearer test-token'}
+        )
+
+        self.assertEqual(response.status_code, 500)
+
 
 if __name__ == '__main__':
     unittest.main()